@@ -1,388 +1,721 @@
-import copy
+from array import array
+import multiprocessing
+import random
 import sys
 import time
 
+#Numba is optional: when it is installed, the forward checking search is compiled to machine code, and otherwise it runs as plain Python.
+try:
+	import numpy
+	from numba import njit
+except ImportError:
+	numpy = None
+
+#The constraints of sudoku are the same for every puzzle, so they are generated just once.
+#The 27 groups of cells that must each hold 1-9 exactly once: nine rows, nine columns, and nine squares.
+UNITS = tuple(tuple(range(r * 9, r * 9 + 9)) for r in range(9)) + tuple(tuple(range(c, 81, 9)) for c in range(9)) + tuple(tuple(r * 9 + c for r in range(br, br + 3) for c in range(bc, bc + 3)) for br in (0, 3, 6) for bc in (0, 3, 6))
+#For each cell, the indices in UNITS of its row, column, and square, where the square of row r and column c is (r // 3) * 3 + c // 3.
+CELL_UNITS = tuple((i // 9, 9 + i % 9, 18 + (i // 9 // 3) * 3 + i % 9 // 3) for i in range(81))
+#For each cell, the indices of all cells whose values are constrained by it: every other cell sharing a row, column, or square with it.
+PEERS = tuple(tuple(sorted(set(j for u in CELL_UNITS[i] for j in UNITS[u] if j != i))) for i in range(81))
+if numpy is not None:
+	PEER_ARRAY = numpy.array(PEERS, numpy.intp)
+#For each value 1-9, its bit in a range, and the mask that clears that bit from a range; index 0 is unused.
+VALUE_BITS = (0,) + tuple(1 << v for v in range(9))
+CLEAR_MASKS = (0x1FF,) + tuple(0x1FF ^ (1 << v) for v in range(9))
+#The possible values in each of the 512 possible ranges, in ascending order, and how many there are, i.e. the number of bits set in each 9-bit mask.
+RANGE_VALUES = tuple(tuple(v + 1 for v in range(9) if mask & (1 << v)) for mask in range(512))
+RANGE_SIZES = tuple(len(values) for values in RANGE_VALUES)
+#Each assignment records at most the assigned cell and its 20 peers on the trail, as pairs of cell and previous range.
+TRAIL_SIZE = 81 * 21 * 2
+
+def compiled(function):
+	"""
+	Compiles the specified function with Numba if it is installed, and otherwise returns it unchanged.
+	"""
+	if numpy is None:
+		return function
+	return njit(cache=True)(function)
+
+def newBuffer(size):
+	"""
+	Returns a zeroed array of small integers of the specified size, of the kind the compiled functions work on.
+	"""
+	if numpy is None:
+		return array("h", [0]) * size
+	return numpy.zeros(size, numpy.int16)
+
+@compiled
+def pickMRVCell(values, domains, order):
+	"""
+	Selects the unassigned cell with the fewest possible values, according to MRV, breaking ties by whichever comes first in the specified order of cells.
+	Returns -1 if some unassigned cell has no possible values left, since the puzzle can then no longer be solved.
+	"""
+	best = -1
+	bestSize = 10
+	for i in order:
+		if values[i] == 0:
+			size = RANGE_SIZES[domains[i]]
+			if size == 0:
+				return -1
+			if size < bestSize:
+				best = i
+				bestSize = size
+				#No cell can have fewer possible values than one, so stop looking.
+				if size == 1:
+					break
+	return best
+
+@compiled
+def forwardCheckLoop(values, domains, peers, order, cells, options, marks, trail):
+	"""
+	The search portion of the forward checking algorithm, written as a loop over flat arrays so that Numba is able to compile it.
+	For each level of the search, cells, options, and marks hold the cell being filled, the values not yet tried for it, and the length of the trail before it was filled.
+	Returns whether the puzzle has been solved, and the number of nodes generated.
+	"""
+	openCells = 0
+	for i in range(81):
+		if values[i] == 0:
+			openCells += 1
+	if openCells == 0:
+		return True, 0
+	counter = 0
+	depth = 0
+	top = 0
+	cells[0] = pickMRVCell(values, domains, order)
+	if cells[0] == -1:
+		return False, 0
+	options[0] = domains[cells[0]]
+	marks[0] = 0
+	while depth >= 0:
+		cell = cells[depth]
+		#Undo the last value tried at this level, if any, by restoring every range recorded on the trail since.
+		while top > marks[depth]:
+			top -= 2
+			values[trail[top]] = 0
+			domains[trail[top]] = trail[top + 1]
+		#If every value has been tried here, backtrack to the previous level.
+		if options[depth] == 0:
+			depth -= 1
+			continue
+		#Otherwise, try the smallest remaining value for this cell...
+		value = 1
+		while not options[depth] & (1 << (value - 1)):
+			value += 1
+		bit = 1 << (value - 1)
+		options[depth] ^= bit
+		#...and prune it from the ranges of all connected cells.
+		trail[top] = cell
+		trail[top + 1] = domains[cell]
+		top += 2
+		for p in peers[cell]:
+			if domains[p] & bit:
+				trail[top] = p
+				trail[top + 1] = domains[p]
+				top += 2
+				domains[p] &= 0x1FF ^ bit
+		values[cell] = value
+		domains[cell] = 0
+		counter += 1
+		if depth + 1 == openCells:
+			return True, counter
+		#Then move on to the next cell, unless some cell can no longer be filled, in which case the next value is tried here.
+		nextCell = pickMRVCell(values, domains, order)
+		if nextCell != -1:
+			depth += 1
+			cells[depth] = nextCell
+			options[depth] = domains[nextCell]
+			marks[depth] = top
+	return False, counter
+
+def warmUp():
+	"""
+	Makes a trivial call to the compiled functions, so that loading them is not counted in the time of the first search.
+	Every range of the blank board passed is empty, so the search gives up as soon as it picks its first cell.
+	"""
+	if numpy is not None:
+		forwardCheckLoop(numpy.zeros(81, numpy.uint8), numpy.zeros(81, numpy.uint16), PEER_ARRAY, numpy.arange(81, dtype=numpy.intp), newBuffer(81), newBuffer(81), newBuffer(81), newBuffer(TRAIL_SIZE))
+
+def assignValue(values, domains, cell, value, trail):
+	"""
+	Sets the value of the specified cell in a puzzle's value and range arrays, and then keeps propagating the constraints: any cell left with only one possible value is set to it, and any value left with only one possible cell in a row, column, or square is set there.
+	The previous range of every cell that changes is recorded on the trail, so that the whole assignment can be undone at once.
+	Returns False if a contradiction is reached, i.e. some cell is left without any possible values, or some value without any possible cell in a unit.
+	"""
+	record = trail.append
+	pending = [(cell, value)]
+	while pending:
+		#Make every assignment waiting to be made, noting any connected cell that is left with a single possible value.
+		while pending:
+			cell, value = pending.pop()
+			if values[cell] != 0:
+				if values[cell] != value:
+					return False
+				continue
+			bit = VALUE_BITS[value]
+			if not domains[cell] & bit:
+				return False
+			mask = CLEAR_MASKS[value]
+			record((cell, domains[cell]))
+			values[cell] = value
+			domains[cell] = 0
+			for i in PEERS[cell]:
+				domain = domains[i]
+				if domain & bit:
+					record((i, domain))
+					domain &= mask
+					domains[i] = domain
+					if domain == 0:
+						return False
+					if domain & (domain - 1) == 0:
+						pending.append((i, domain.bit_length()))
+		#Then look for any value that has only one possible cell left in some unit.
+		for unit in UNITS:
+			placed = 0
+			once = 0
+			twice = 0
+			for i in unit:
+				if values[i] != 0:
+					placed |= VALUE_BITS[values[i]]
+				else:
+					twice |= once & domains[i]
+					once |= domains[i]
+			if (placed | once) != 0x1FF:
+				return False
+			singles = once & ~twice & ~placed
+			if singles:
+				for i in unit:
+					if values[i] == 0 and domains[i] & singles:
+						pending.append((i, (domains[i] & singles).bit_length()))
+	return True
+
+def backTrackRecursion(values, domains, trail, counter):
+	"""
+	The recursive portion of the backtrack algorithm, working directly on a puzzle's value and range arrays.
+	Every change is recorded on the trail so that it can be undone when backtracking, and each node generated is added to the single-item counter list.
+	Returns whether the puzzle has been solved.
+	"""
+	#If all cells have been filled, the puzzle has been solved.
+	if values.count(0) == 0:
+		return True
+	#Cells are always filled in the same order, so no board can be reached twice, and there is nothing to gain from remembering boards that led nowhere.
+	#Select the first available cell that has no value.
+	cell = values.find(0)
+	for value in RANGE_VALUES[domains[cell]]:
+		#Try the first possible value for this cell, and then the next if that doesn't work, etc.
+		mark = len(trail)
+		counter[0] += 1
+		#Then, unless that leads to a contradiction, move to the next available cell.
+		if assignValue(values, domains, cell, value, trail) and backTrackRecursion(values, domains, trail, counter):
+			return True
+		#Otherwise, we've backtracked here and need to undo this value before trying the next one.
+		while len(trail) > mark:
+			i, previous = trail.pop()
+			values[i] = 0
+			domains[i] = previous
+	return False
+
+def linkExactCover():
+	"""
+	Builds the dancing links matrix for sudoku as an exact cover problem, as used by the DancingLinks class.
+	Node 0 is the root, nodes 1-324 head the columns, and every other node is a 1 in the matrix, linked to its neighbours in the same row and column.
+	Returns lists of each node's left, right, up, and down neighbours and column header, the number of nodes in each column, the candidate row of each node, and the first node of each candidate row.
+	"""
+	columns = 324
+	left = [columns] + list(range(0, columns))
+	right = list(range(1, columns + 1)) + [0]
+	up = list(range(0, columns + 1))
+	down = list(range(0, columns + 1))
+	header = list(range(0, columns + 1))
+	sizes = [0] * (columns + 1)
+	rowOf = [-1] * (columns + 1)
+	rowStart = []
+	for row in range(729):
+		cell, digit = row // 9, row % 9
+		r, c = cell // 9, cell % 9
+		square = (r // 3) * 3 + c // 3
+		#Placing a digit in a cell fills the cell, and uses the digit in the cell's row, column, and square.
+		first = len(left)
+		rowStart.append(first)
+		for column in (cell, 81 + r * 9 + digit, 162 + c * 9 + digit, 243 + square * 9 + digit):
+			h = column + 1
+			node = len(left)
+			#Link the node into its row, between the previous node and the first...
+			left.append(node - 1 if node > first else node)
+			right.append(first)
+			if node > first:
+				right[node - 1] = node
+				left[first] = node
+			#...and at the bottom of its column.
+			up.append(up[h])
+			down.append(h)
+			down[up[h]] = node
+			up[h] = node
+			header.append(h)
+			sizes[h] += 1
+			rowOf.append(row)
+	return left, right, up, down, header, sizes, rowOf, rowStart
+
+#The exact cover matrix is the same for every puzzle, so it is linked just once and copied for each search.
+EXACT_COVER = linkExactCover()
+
 class SudokuSolver:
 	"""
-	This class allows for the solving of sudoku puzzles, using one of three algorithms: brute force, backtracking with constraint satisfaction, and forward checking with the MRV heuristic.
+	This class allows for the solving of sudoku puzzles, using one of four algorithms: brute force, backtracking with constraint satisfaction, forward checking with the MRV heuristic, and dancing links.
+	The last three can also be run as a portfolio, racing several variants of them against each other in parallel.
 	"""
 
 	def readCommand(self, puzzle, name, algorithm, startTime):
 		"""
-		Takes in a sudoku puzzle, its name, the time at which the program began running, and the specification for which of the three algorithms to use.
+		Takes in a sudoku puzzle, its name, the time at which the program began running, and the specification for which of the four algorithms, or the portfolio of them, to use.
 		If an invalid algorithm parameter is passed, returns an error.
 		"""
-		if algorithm == "BF" or algorithm == "BT" or algorithm == "FC-MRV":
+		if algorithm == "BF" or algorithm == "BT" or algorithm == "FC-MRV" or algorithm == "DLX" or algorithm == "PORTFOLIO":
 			if algorithm == "BF":
 				self.bruteForceSearch(puzzle, name, startTime)
 			if algorithm == "BT":
 				self.backTrackSearch(puzzle, name, startTime)
 			if algorithm == "FC-MRV":
 				self.forwardCheckSearch(puzzle, name, startTime)
+			if algorithm == "DLX":
+				self.dancingLinksSearch(puzzle, name, startTime)
+			if algorithm == "PORTFOLIO":
+				self.portfolioSearch(puzzle, name, startTime)
 		else:
-			return "Just one of BF, BT, or FC-MRV must be passed as an argument."
+			return "Just one of BF, BT, FC-MRV, DLX, or PORTFOLIO must be passed as an argument."
 			
 	def bruteForceSearch(self, puzzle, name, pStartTime):
 		"""
 		Tests every single possible combination of numbers for all blank cells, ignoring constraints, until a solution is found.
 		This algorithm will almost certainly never reach the solution in anything resembling a reasonable amount of time.
 		"""
-		failure = False
 		counter = 0
-		workingPuzzle = copy.deepcopy(puzzle)
+		workingPuzzle = puzzle.copy()
+		values = workingPuzzle.values
 		validCells = workingPuzzle.getCells()
 		sStartTime = time.time()
 		#Start by assigning the number 1 to all open cells.
 		for i in validCells:
-			workingPuzzle.setValue(i, 1)
+			values[i] = 1
 			counter += 1
-		#As long as either the puzzle hasn't been solved or the algorithm hasn't failed, work recursively, starting from the first open cell (assuming one begins at A1 and moves right, then down).
-		while not workingPuzzle.isValid() and not failure:
-			workingPuzzle, failure = self.bruteForceRecursion(workingPuzzle, 0, validCells, failure)
+		#Count through every combination like an odometer, with the open cells as its digits, starting from the first open cell (assuming one begins at A1 and moves right, then down).
+		solved = workingPuzzle.isValid()
+		while not solved:
+			for i in validCells:
+				#If the current cell is below 9, increment it; otherwise, reset it to 1 and carry over to the next cell.
+				if values[i] < 9:
+					values[i] += 1
+					break
+				values[i] = 1
+			else:
+				#If every cell was carried over, every combination has been tried without finding a solution.
+				break
 			counter += 1
+			solved = workingPuzzle.isValid()
 		endTime = time.time()
-		if failure:
-			print "No solution exists."
+		if not solved:
+			print("No solution exists.")
 		else:
 			self.printSolution(workingPuzzle, name, counter, (endTime - sStartTime), (endTime - pStartTime))
 	
-	def bruteForceRecursion(self, puzzle, cell, availableCells, failure):
-		"""
-		Recursive portion of the brute force algorithm.
-		Returns either a solved puzzle or a failure.
-		"""
-		#If the last cell has been reached without finding a solution, return a failure.
-		if cell > len(availableCells):
-			failure = True
-			return puzzle, failure
-		#If the current cell is 9, reset to 1 and increment the next cell over.
-		if puzzle.getValue(availableCells[cell]) == 9:
-			puzzle.setValue(availableCells[cell], 1)
-			return self.bruteForceRecursion(puzzle, cell + 1, availableCells, failure)
-		puzzle.setValue(availableCells[cell], puzzle.getValue(availableCells[cell]) + 1)
-		return puzzle, failure
-	
 	def backTrackSearch(self, puzzle, name, pStartTime):
 		"""
 		Uses backtracking and constraint satisfaction to find a solution to the specified sudoku puzzle, taking in the puzzle, its name, and the program start time.
 		Either returns a failure, or prints the solution and performance to both the console and two text files.
 		"""
-		failure = False
-		counter = 0
-		workingPuzzle = copy.deepcopy(puzzle)
-		validcells = workingPuzzle.getCells()
+		workingPuzzle = puzzle.copy()
 		sStartTime = time.time()
-		while not workingPuzzle.isValid() and not failure:
-			workingPuzzle, failure, counter = self.backTrackRecursion(workingPuzzle, failure, counter)
+		solved, counter = self.backTrackSolve(workingPuzzle)
 		endTime = time.time()
-		if failure:
-			print "No solution exists."
+		if not solved:
+			print("No solution exists.")
 		else:
 			self.printSolution(workingPuzzle, name, counter, (endTime - sStartTime), (endTime - pStartTime))
 
-	def backTrackRecursion(self, puzzle, failure, counter):
-		"""
-		The recursive portion of the backtrack algorithm.
-		Returns either a solved puzzle or a failure.
-		"""
-		workingPuzzle = copy.deepcopy(puzzle)
-		failure = False
-		#If all cells have been filled without finding a solution, the algorithm has failed.
-		if puzzle.numOpenCells() == 0:
-			return puzzle, failure, counter
-		#Select the first available cell that has no value.
-		currentCell, failure = self.setValue(workingPuzzle, failure)
-		for i in workingPuzzle.getRange(currentCell):
-			#Try the first possible value for this cell, and then the next if that doesn't work, etc.
-			workingPuzzle.setValue(currentCell, i)
-			counter += 1
-			#Then move to the next available cell.
-			workingPuzzle, failure, fCounter = self.backTrackRecursion(workingPuzzle, failure, counter)
-			if not failure:
-				#If we've reached this point without a failure, then the puzzle has been solved.
-				return workingPuzzle, failure, fCounter
-			#Otherwise, we've backtracked here and need to try the next available value.
-			workingPuzzle, failure = self.resetValue(puzzle, failure)
-		failure = True
-		return workingPuzzle, failure, counter
-		
+	def backTrackSolve(self, puzzle):
+		"""
+		Solves the specified puzzle in place using backtracking and constraint satisfaction.
+		Returns whether the puzzle has been solved, and the number of nodes generated.
+		"""
+		if not puzzle.isConsistent():
+			return False, 0
+		counter = [0]
+		solved = backTrackRecursion(puzzle.values, puzzle.domains, [], counter)
+		return solved, counter[0]
+
 	def forwardCheckSearch(self, puzzle, name, pStartTime):
 		"""
 		Uses forward checking and the minimum remaining values heuristic to find a solution to the specified sudoku puzzle, taking in the puzzle, its name, and the program start time.
 		Either returns a failure, or prints the solution and performance to both the console and two text files.
 		"""
-		failure = False
-		counter = 0
-		workingPuzzle = copy.deepcopy(puzzle)
-		validcells = workingPuzzle.getCells()
+		workingPuzzle = puzzle.copy()
+		warmUp()
 		sStartTime = time.time()
-		while not workingPuzzle.isValid() and not failure:
-			workingPuzzle, failure, counter = self.forwardCheckRecursion(workingPuzzle, failure, counter)
+		solved, counter = self.forwardCheckSolve(workingPuzzle)
 		endTime = time.time()
-		if failure:
-			print "No solution exists."
+		if not solved:
+			print("No solution exists.")
 		else:
 			self.printSolution(workingPuzzle, name, counter, (endTime - sStartTime), (endTime - pStartTime))
-	
-	def forwardCheckRecursion(self, puzzle, failure, counter):
-		"""
-		The recursive portion of the forward checking algorithm.
-		Returns either a solved puzzle or a failure.
-		"""
-		workingPuzzle = copy.deepcopy(puzzle)
-		failure = False
-		#If all cells have been filled without finding a solution, the algorithm has failed.
-		if puzzle.numOpenCells() == 0:
-			return puzzle, failure, counter
-		#Try to get a list of all of the cells sharing the smallest number of possible values.
-		cellOptions, failure = self.applyMRV(workingPuzzle, failure)
-		if not failure:
-			#If successful, try the first of those cells...
-			for h in cellOptions:
-				for i in workingPuzzle.getRange(h):
-					#Try the first possible value for this cell, and then the next if that doesn't work, etc.
-					workingPuzzle.setValue(h, i)
-					counter += 1
-					#Then move to the next available cell.
-					workingPuzzle, failure, fCounter = self.forwardCheckRecursion(workingPuzzle, failure, counter)
-					if not failure:
-						#If we've reached this point without a failure, then the puzzle has been solved.
-						return workingPuzzle, failure, fCounter
-					#Otherwise, we've backtracked here and need to try the next available value.
-					workingPuzzle, failure = self.resetValue(puzzle, failure)
-				failure = True
-				return workingPuzzle, failure, counter
-		return workingPuzzle, failure, counter
-		
-	def printSolution(self, puzzle, name, counter, searchTime, programTime):
-		"""
-		Prints the solution and performance to the console.
-		"""
-		solution = puzzle.printBoard()
-		print solution
-		self.writeSolution(solution, name)
-		self.writePerformance(programTime, searchTime, counter, name)
-		print "Total clock time: " + str(programTime * 1000)
-		print "Search clock time: " + str(searchTime * 1000)
-		print "Number of nodes generated: " + str(counter)
 
-	def writeSolution(self, solution, name):
-		"""
-		Writes the solution to a text file.
-		"""
-		fName = name[6:]
-		file = open("solution" + fName, "w")
-		file.write(solution)
-		file.close
+	def forwardCheckSolve(self, puzzle, seed=None):
+		"""
+		Solves the specified puzzle in place using forward checking and the MRV heuristic.
+		Ties between cells are broken from A1 to I9, or in a random order if a seed is passed.
+		Returns whether the puzzle has been solved, and the number of nodes generated.
+		"""
+		if not puzzle.isConsistent():
+			return False, 0
+		order = list(range(81))
+		if seed is not None:
+			random.Random(seed).shuffle(order)
+		if numpy is None:
+			values, domains, peers, order = puzzle.values, puzzle.domains, PEERS, tuple(order)
+		else:
+			#Compiled code needs NumPy arrays, which can share memory with the puzzle's own arrays rather than copying them.
+			values = numpy.frombuffer(puzzle.values, numpy.uint8)
+			domains = numpy.frombuffer(puzzle.domains, numpy.uint16)
+			peers = PEER_ARRAY
+			order = numpy.array(order, numpy.intp)
+		return forwardCheckLoop(values, domains, peers, order, newBuffer(81), newBuffer(81), newBuffer(81), newBuffer(TRAIL_SIZE))
 
-	def writePerformance(self, pTime, sTime, counter, name):
+	def dancingLinksSearch(self, puzzle, name, pStartTime):
 		"""
-		Writes the performance stats to a text file.
+		Uses Knuth's Algorithm X with dancing links to find a solution to the specified sudoku puzzle, treated as an exact cover problem, taking in the puzzle, its name, and the program start time.
+		Either returns a failure, or prints the solution and performance to both the console and two text files.
 		"""
-		fName = name[6:]
-		file = open("performance" + fName, "w")
-		file.write("Total clock time: " + str(pTime * 1000) + "\n")
-		file.write("Search clock time: " + str(sTime * 1000) + "\n")
-		file.write("Number of nodes generated: " + str(counter) + "\n")
-	
-	def setValue(self, puzzle, failure):
+		workingPuzzle = puzzle.copy()
+		sStartTime = time.time()
+		solved, counter = self.dancingLinksSolve(workingPuzzle)
+		endTime = time.time()
+		if not solved:
+			print("No solution exists.")
+		else:
+			self.printSolution(workingPuzzle, name, counter, (endTime - sStartTime), (endTime - pStartTime))
+
+	def dancingLinksSolve(self, puzzle):
+		"""
+		Solves the specified puzzle in place using Algorithm X with dancing links.
+		Returns whether the puzzle has been solved, and the number of nodes generated.
+		"""
+		links = DancingLinks(puzzle)
+		if not links.consistent:
+			return False, 0
+		solution = []
+		counter = [0]
+		if not links.search(solution, counter):
+			return False, counter[0]
+		#Each selected row places one value in one cell.
+		for node in solution:
+			row = links.rowOf[node]
+			puzzle.values[row // 9] = row % 9 + 1
+			puzzle.domains[row // 9] = 0
+		return True, counter[0]
+
+	def portfolioSearch(self, puzzle, name, pStartTime):
 		"""
-		Sets the value of the first unassigned variable in the puzzle.
+		Runs backtracking, dancing links, forward checking, and forward checking with randomly ordered MRV ties all at once, one per processor, taking in the puzzle, its name, and the program start time.
+		Whichever search finishes first is used, and the rest are stopped. Since each one searches exhaustively, the first to finish decides whether a solution exists.
+		Puzzles whose given values already conflict are rejected before any search is started, so that the answer never depends on which one finishes first.
+		Either returns a failure, or prints the solution and performance to both the console and two text files.
 		"""
-		for i in puzzle.getCells():
-			if puzzle.getValue(i) == 0:
-				return i, failure
-		return 0, True
-	
-	def resetValue(self, puzzle, failure):
+		if not puzzle.isConsistent():
+			print("No solution exists.")
+			return
+		strategies = [("BT", None), ("DLX", None), ("FC-MRV", None)]
+		for seed in range(1, multiprocessing.cpu_count() - 2):
+			strategies.append(("FC-MRV", seed))
+		sStartTime = time.time()
+		pool = multiprocessing.Pool(len(strategies))
+		try:
+			#Each process is handed its own copy of the puzzle.
+			results = pool.imap_unordered(runStrategy, [(puzzle, algorithm, seed) for algorithm, seed in strategies])
+			algorithm, seed, solved, values, counter = next(results)
+		finally:
+			pool.terminate()
+		endTime = time.time()
+		if not solved:
+			print("No solution exists.")
+		else:
+			workingPuzzle = puzzle.copy()
+			workingPuzzle.values[:] = values
+			self.printSolution(workingPuzzle, name, counter, (endTime - sStartTime), (endTime - pStartTime))
+			if seed is None:
+				print("Fastest strategy: " + algorithm)
+			else:
+				print("Fastest strategy: " + algorithm + " with MRV ties shuffled by seed " + str(seed))
+		
+	def printSolution(self, puzzle, name, counter, searchTime, programTime):
 		"""
-		Resets the puzzle and its values to the last version.
+		Prints the solution and performance to the console.
 		"""
-		resetPuzzle = copy.deepcopy(puzzle)
-		return resetPuzzle, failure
-	
-	def applyMRV(self, puzzle, failure):
+		solution = puzzle.printBoard()
+		print(solution)
+		self.writeResults(solution, name, programTime, searchTime, counter)
+		print("Total clock time: " + str(programTime * 1000))
+		print("Search clock time: " + str(searchTime * 1000))
+		print("Number of nodes generated: " + str(counter))
+
+	def writeResults(self, solution, name, pTime, sTime, counter):
 		"""
-		Selects the unassigned cells that meet the MRV heuristic.
+		Writes the solution and the performance stats to two text files.
 		"""
-		cells = puzzle.getSmallestRange()
-		if cells is None:
-			failure = True
-		return cells, failure
+		fName = name[6:]
+		with open("solution" + fName, "w") as file:
+			file.write(solution)
+		with open("performance" + fName, "w") as file:
+			file.write("Total clock time: " + str(pTime * 1000) + "\n" + "Search clock time: " + str(sTime * 1000) + "\n" + "Number of nodes generated: " + str(counter) + "\n")
 
 
 
 class SudokuPuzzle:
 	"""
 	This class instantiates an object that represents a particular sudoku puzzle, its configuration, and the inherent constraints of sudoku puzzles.
+	Cells are referred to by index, from 0 (A1) to 80 (I9), reading left to right, top to bottom.
 	"""
 
 	def __init__(self, textFile):
 		"""
 		Initializes a sudoku puzzle using the specified text file.
 		"""
-		numbers = "123456789"
-		letters = "ABCDEFGHI"
-		self.keyList = []
-		#Generate every possible combination of letters and numbers to create A1 to I9.
-		for i in letters:
-			for j in numbers:
-				self.keyList.append(i + j)
-		puzzleFile = open(textFile)
-		initialList = []
 		#Convert the contents of the text file into a list of individual cells read from left to right, top to bottom, corresponding with A1 to I9.
-		for row in puzzleFile:
-			initialList.append(row.split())
-		puzzleFile.close()
-		initialList = initialList[0] + initialList[1] + initialList[2] + initialList[3] + initialList[4] + initialList[5] + initialList[6] + initialList[7] + initialList[8]
-		cellList = []
-		for i in initialList:
-			cellList.append(int(i))
-		self.cellReferents = {}
-		self.cellRanges = {}
-		self.cellValues = {}
-		self.fixedCells = []
-		#Generate a list of all cells whose values are constrained by the current cell, storing them in a dictionary keyed to this cell.
-		for i in self.keyList:
-			referents = []
-			for j in self.keyList:
-				#This grabs all cells in the same row or column.
-				if (i[0] in j or i[1] in j) and (i != j) and (j not in referents):
-					referents.append(j)
-				#The rest of these grab any cells in the same square.
-				if (i[0] in "ABC123" and i[1] in "ABC123") and (j[0] in "ABC123" and j[1] in "ABC123") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "DEF123" and i[1] in "DEF123") and (j[0] in "DEF123" and j[1] in "DEF123") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "GHI123" and i[1] in "GHI123") and (j[0] in "GHI123" and j[1] in "GHI123") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "ABC456" and i[1] in "ABC456") and (j[0] in "ABC456" and j[1] in "ABC456") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "DEF456" and i[1] in "DEF456") and (j[0] in "DEF456" and j[1] in "DEF456") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "GHI456" and i[1] in "GHI456") and (j[0] in "GHI456" and j[1] in "GHI456") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "ABC789" and i[1] in "ABC789") and (j[0] in "ABC789" and j[1] in "ABC789") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "DEF789" and i[1] in "DEF789") and (j[0] in "DEF789" and j[1] in "DEF789") and (i != j) and (j not in referents):
-					referents.append(j)
-				if (i[0] in "GHI789" and i[1] in "GHI789") and (j[0] in "GHI789" and j[1] in "GHI789") and (i != j) and (j not in referents):
-					referents.append(j)
-			self.cellReferents[i] = referents
-			self.cellRanges[i] = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-		#Set list of possible values for every empty cell, starting with 1-9...
+		with open(textFile) as puzzleFile:
+			initialList = puzzleFile.read().split()
+		#Cell values are stored as one byte per cell, with 0 meaning unassigned.
+		self.values = bytearray(int(i) for i in initialList[:81])
+		#Possible values are stored as a 9-bit mask per cell, with bit v-1 set if v is still allowed.
+		#An empty cell allows every value not yet used in any of its units, so find the values used in each unit first...
+		used = [0] * len(UNITS)
+		for u in range(len(UNITS)):
+			for i in UNITS[u]:
+				used[u] |= VALUE_BITS[self.values[i]]
+		#...and then clear them from the ranges of all cells in that unit at once.
+		self.domains = array("H", [0] * 81)
 		for i in range(0, 81):
-			self.cellValues[self.keyList[i]] = cellList[i]
-			if cellList[i] != 0:
-				self.fixedCells.append(self.keyList[i])
-		#...and then pruning possible values based on the values of any connected cells.
-		for i in self.keyList:
-			value = self.cellValues[i]
-			if value != 0:
-				for j in self.cellReferents[i]:
-					if value in self.cellRanges[j]:
-						tempRange = self.cellRanges[j]
-						tempRange.remove(value)
-						self.cellRanges[j] = tempRange
-		for i in self.fixedCells:
-			self.cellRanges[i] = []
+			if self.values[i] == 0:
+				row, column, square = CELL_UNITS[i]
+				self.domains[i] = 0x1FF & ~(used[row] | used[column] | used[square])
+	
+	def copy(self):
+		"""
+		Returns an independent copy of the puzzle, duplicating only its value and range arrays.
+		"""
+		#Skip __init__, which reads the puzzle file; the whole state is the two arrays, so slicing them is enough.
+		puzzleCopy = SudokuPuzzle.__new__(SudokuPuzzle)
+		puzzleCopy.values = self.values[:]
+		puzzleCopy.domains = self.domains[:]
+		return puzzleCopy
 	
 	def isValid(self):
 		"""
 		Checks whether the current puzzle configuration meets the constraints.
 		"""
-		for i in self.keyList:
-			value = self.cellValues[i]
-			for j in self.cellReferents[i]:
-				if value == self.cellValues[j]:
+		values = self.values
+		#A unit is satisfied only if OR-ing together a bit for each of its values sets all nine bits.
+		for unit in UNITS:
+			seen = 0
+			for i in unit:
+				value = values[i]
+				if value == 0:
 					return False
+				seen |= 1 << (value - 1)
+			if seen != 0x1FF:
+				return False
+		return True
+	
+	def isConsistent(self):
+		"""
+		Checks whether the values assigned so far meet the constraints, i.e. no unit holds the same value twice.
+		"""
+		#The searches only ever prune the ranges of unassigned cells, so two given values that conflict would never be noticed, and each solver checks this first.
+		values = self.values
+		for unit in UNITS:
+			seen = 0
+			for i in unit:
+				bit = VALUE_BITS[values[i]]
+				if seen & bit:
+					return False
+				seen |= bit
 		return True
 		
 	def getRange(self, cell):
 		"""
-		Returns a list of allowed values for the specified cell, according to constraints.
+		Returns a tuple of allowed values for the specified cell, according to constraints.
 		"""
-		return self.cellRanges[cell]
+		return RANGE_VALUES[self.domains[cell]]
 		
 	def getCells(self):
 		"""
 		Returns a list of cells that haven't yet been assigned values.
 		"""
-		availableCells = copy.deepcopy(self.keyList)
-		for i in self.fixedCells:
-			availableCells.remove(i)
-		return availableCells
+		return [i for i in range(0, 81) if self.values[i] == 0]
 		
 	def numOpenCells(self):
 		"""
 		Returns the number of unassigned cells.
 		"""
-		openCells = 0
-		for i in self.keyList:
-			if self.cellValues[i] == 0:
-				openCells += 1
-		return openCells
+		return self.values.count(0)
 	
 	def setValue(self, cell, value):
 		"""
 		Sets the value of the specified cell, and prunes the ranges of possible values for all connected cells, according to constraints.
 		"""
-		self.cellValues[cell] = value
-		self.cellRanges[cell] = []
-		for i in self.cellReferents[cell]:
-			if value in self.cellRanges[i]:
-				tempRange = self.cellRanges[i]
-				tempRange.remove(value)
-				self.cellRanges[i] = tempRange
+		domains = self.domains
+		mask = CLEAR_MASKS[value]
+		for i in PEERS[cell]:
+			domains[i] &= mask
+		self.values[cell] = value
+		domains[cell] = 0
 
 	def getValue(self, cell):
 		"""
 		Returns the value of the specified cell.
 		"""
-		return self.cellValues[cell]
-	
-	def getSmallestRange(self):
-		"""
-		Returns a list of the unassigned cells with the fewest possible values, according to MRV.
-		"""
-		rangeSizes = []
-		cellList = self.getCells()
-		locations = []
-		for i in cellList:
-			if len(self.cellRanges[i]) > 0:
-				locations.append(i)
-				rangeSizes.append(len(self.cellRanges[i]))
-		if rangeSizes == []:
-			return None
-		output = []
-		smallest = min(rangeSizes)
-		if rangeSizes.count(smallest) > 1:
-			for i in range(rangeSizes.count(smallest)):
-				output.append(locations[rangeSizes.index(smallest)])
-				locations = locations[rangeSizes.index(smallest)+1:]
-				rangeSizes = rangeSizes[rangeSizes.index(smallest)+1:]
-		else:
-			output.append(locations[rangeSizes.index(smallest)])
-		return output
+		return self.values[cell]
 			
 	def printBoard(self):
 		"""
 		Returns a 2D string representation of the puzzle.
 		"""
-		rows = ""
-		for h in "ABCDEFGHI":
-			for i in self.keyList:
-				if i[0] == h:
-					rows += str(self.cellValues[i]) + " "
-			rows += "\n"
-		return rows
+		#Each row is its nine values, each followed by a space, on a line of its own.
+		return "".join(" ".join(str(v) for v in self.values[h:h + 9]) + " \n" for h in range(0, 81, 9))
+
+
+
+class DancingLinks:
+	"""
+	This class represents a sudoku puzzle as an exact cover problem, to be solved with Knuth's Algorithm X using dancing links.
+	Each of the 729 rows of the matrix places one value in one cell, and each of the 324 columns is a constraint: that a cell holds a value, or that a row, column, or square holds a particular value. A solution is a set of rows that covers every column exactly once.
+	"""
+
+	def __init__(self, puzzle):
+		"""
+		Copies the exact cover matrix and removes the rows and columns already decided by the puzzle's assigned cells.
+		"""
+		self.left, self.right, self.up, self.down, self.header, self.sizes = [list(links) for links in EXACT_COVER[:6]]
+		self.rowOf, self.rowStart = EXACT_COVER[6], EXACT_COVER[7]
+		self.consistent = True
+		for cell in range(0, 81):
+			if puzzle.values[cell] != 0:
+				if not self.select(self.rowStart[cell * 9 + puzzle.values[cell] - 1]):
+					self.consistent = False
+	
+	def select(self, node):
+		"""
+		Covers every column of the row of the specified node, unless one of them has already been covered.
+		Returns whether the row could be selected.
+		"""
+		columns = []
+		j = node
+		while True:
+			columns.append(self.header[j])
+			j = self.right[j]
+			if j == node:
+				break
+		for h in columns:
+			#A covered column has been unlinked from its neighbours, so its neighbour no longer points back to it.
+			if self.right[self.left[h]] != h:
+				return False
+		for h in columns:
+			self.cover(h)
+		return True
+	
+	def cover(self, h):
+		"""
+		Removes the specified column from the header list, and every row with a node in that column from the other columns.
+		"""
+		left, right, up, down, header, sizes = self.left, self.right, self.up, self.down, self.header, self.sizes
+		right[left[h]] = right[h]
+		left[right[h]] = left[h]
+		i = down[h]
+		while i != h:
+			j = right[i]
+			while j != i:
+				down[up[j]] = down[j]
+				up[down[j]] = up[j]
+				sizes[header[j]] -= 1
+				j = right[j]
+			i = down[i]
+	
+	def uncover(self, h):
+		"""
+		Reverses cover for the specified column, relinking everything in the opposite order to that in which it was removed.
+		"""
+		left, right, up, down, header, sizes = self.left, self.right, self.up, self.down, self.header, self.sizes
+		i = up[h]
+		while i != h:
+			j = left[i]
+			while j != i:
+				sizes[header[j]] += 1
+				down[up[j]] = j
+				up[down[j]] = j
+				j = left[j]
+			i = up[i]
+		right[left[h]] = h
+		left[right[h]] = h
+	
+	def search(self, solution, counter):
+		"""
+		The recursive portion of Algorithm X, adding the nodes of the selected rows to the solution, and each node generated to the single-item counter list.
+		Returns whether every column has been covered.
+		"""
+		right = self.right
+		#If every column has been covered, the puzzle has been solved.
+		if right[0] == 0:
+			return True
+		#Select the column with the fewest rows left, which is the most constrained.
+		best = right[0]
+		h = right[best]
+		while h != 0:
+			if self.sizes[h] < self.sizes[best]:
+				best = h
+			h = right[h]
+		self.cover(best)
+		i = self.down[best]
+		while i != best:
+			#Try each row in this column, covering the other columns it fills.
+			solution.append(i)
+			counter[0] += 1
+			j = right[i]
+			while j != i:
+				self.cover(self.header[j])
+				j = right[j]
+			if self.search(solution, counter):
+				return True
+			#Otherwise, put the columns back in reverse order and try the next row.
+			j = self.left[i]
+			while j != i:
+				self.uncover(self.header[j])
+				j = self.left[j]
+			solution.pop()
+			i = self.down[i]
+		self.uncover(best)
+		return False
+
+
+
+def runStrategy(task):
+	"""
+	Solves a puzzle with one of the strategies of the portfolio search, in a worker process.
+	The task is a tuple of the puzzle, the algorithm (BT, DLX, or FC-MRV), and the seed for shuffling MRV ties, if any.
+	Returns the task's algorithm and seed, whether the puzzle has been solved, the resulting values, and the number of nodes generated.
+	"""
+	puzzle, algorithm, seed = task
+	solver = SudokuSolver()
+	if algorithm == "BT":
+		solved, counter = solver.backTrackSolve(puzzle)
+	elif algorithm == "DLX":
+		solved, counter = solver.dancingLinksSolve(puzzle)
+	else:
+		solved, counter = solver.forwardCheckSolve(puzzle, seed)
+	return algorithm, seed, solved, puzzle.values, counter
 
 
 
 if __name__ == "__main__":
 	programStart = time.time()
 	if len(sys.argv) != 3:
-		print "Wrong number of arguments!"
+		print("Wrong number of arguments!")
 	else:
 		puzzle = SudokuPuzzle(sys.argv[1])
 		solver = SudokuSolver()